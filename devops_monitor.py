@@ -1,14 +1,18 @@
-import glob
-from flask import Flask, jsonify, render_template, request, Response
-import json, os, threading, time, random, uuid
+from flask import Flask, render_template, request, Response, stream_with_context
+import orjson
+import bisect
+import gzip
+import os, queue, shutil, tempfile, threading, time, random, uuid
+from collections import OrderedDict, defaultdict, deque
 from datetime import datetime, timedelta
 from typing import Dict, Any, List
 
 app = Flask(__name__)
 
-DATA_CURRENT = "builds.json"      
-DATA_HISTORY = "history.json"     
-LOGS_DIR = "logs"                
+DATA_CURRENT = "builds.json"
+DATA_HISTORY = "history.jsonl"
+DATA_HISTORY_LEGACY = "history.json"
+LOGS_DIR = "logs"
 os.makedirs(LOGS_DIR, exist_ok=True)
 
 PIPELINE = {
@@ -58,58 +62,222 @@ STEP_FAIL_PROB = {
 }
 
 
+# Per-step output generators keyed by exact step name (including both
+# deploy steps), replacing the old if/startswith chain. Each takes the
+# caller's Random so the per-thread generators compose cleanly.
+_SECURITY_VULNS = (0, 0, 1, 2, 3)
+
+_STEP_OUTPUT = {
+    "checkout": lambda r: "Checked out repository",
+    "install-deps": lambda r: "Dependencies installed successfully",
+    "lint": lambda r: "Lint: flake8 passed (0 errors)",
+    "unit-tests": lambda r: f"Unit tests: {r.randint(80, 220)} passed",
+    "integration-tests": lambda r: f"Integration tests: {r.randint(25, 90)} passed",
+    "security-scan": lambda r: f"Security scan: found {r.choice(_SECURITY_VULNS)} issues (sev: low/med/high mixed)",
+    "build-artifact": lambda r: "Build artifact created: dist/app.zip",
+    "docker-build": lambda r: "Docker build: image tagged 'app:latest'",
+    "deploy-staging": lambda r: "Deploy: rollout completed, healthcheck OK",
+    "deploy-prod": lambda r: "Deploy: rollout completed, healthcheck OK",
+}
+
+
+def _step_output_default(r) -> str:
+    return "Step completed"
+
+
+def _compile_steps(steps: List[str]):
+    return [
+        (step,)
+        + STEP_TIME.get(step, (0.8, 1.8))
+        + (STEP_FAIL_PROB.get(step, 0.10), _STEP_OUTPUT.get(step, _step_output_default))
+        for step in steps
+    ]
+
+
+# (step, tmin, tmax, fail_prob, output_fn) per step, resolved once at import
+# so the simulation loop iterates plain tuples instead of doing dict lookups.
+COMPILED_PIPELINES = {job: _compile_steps(steps) for job, steps in PIPELINE.items()}
+
+
+# Module-level random.* shares one locked Random instance; give each
+# pipeline thread its own generator to avoid contention.
+_RNG_LOCAL = threading.local()
+
+
+def _rng() -> random.Random:
+    rng = getattr(_RNG_LOCAL, "rng", None)
+    if rng is None:
+        rng = _RNG_LOCAL.rng = random.Random()
+    return rng
+
+
 def _utcnow_iso() -> str:
-    return datetime.utcnow().isoformat(timespec="seconds") + "Z"
+    # time.strftime over gmtime stays in C; building a datetime plus
+    # isoformat plus concatenation is noticeably slower per log line.
+    return time.strftime("%Y-%m-%dT%H:%M:%SZ", time.gmtime())
 
 
 def _load_json(path: str, default):
     if not os.path.exists(path):
         return default
-    with open(path, encoding="utf-8") as f:
+    with open(path, "rb") as f:
         try:
-            return json.load(f)
+            return orjson.loads(f.read())
         except Exception:
             return default
 
 
 def _save_json(path: str, obj):
-    with open(path, "w", encoding="utf-8") as f:
-        json.dump(obj, f, indent=2)
+    # Write-to-temp plus os.replace so concurrent readers never observe a
+    # truncated file. mkstemp gives every writer its own temp file; all the
+    # writers here are threads of one process, so a pid-based name would
+    # race and the losing thread's replace would fail.
+    fd, tmp = tempfile.mkstemp(
+        prefix=os.path.basename(path) + ".tmp.",
+        dir=os.path.dirname(path) or ".",
+    )
+    try:
+        with os.fdopen(fd, "wb") as f:
+            f.write(orjson.dumps(obj, option=orjson.OPT_INDENT_2))
+        os.replace(tmp, path)
+    except BaseException:
+        try:
+            os.remove(tmp)
+        except OSError:
+            pass
+        raise
+
+
+def _json_response(obj) -> Response:
+    return Response(orjson.dumps(obj), mimetype="application/json")
+
+
+# History is an append-only JSONL sidecar: one object per line, so run
+# completion costs a single append instead of rewriting the whole file.
+_HISTORY_LOCK = threading.Lock()
 
 
 def _append_history(entry: Dict[str, Any]):
-    hist = _load_json(DATA_HISTORY, [])
-    hist.append(entry)
-    _save_json(DATA_HISTORY, hist)
+    line = orjson.dumps(entry) + b"\n"
+    # The stats lock spans both the file append and the deque push: if the
+    # append landed before a concurrent first seed read the file, the seed
+    # would pick the entry up from disk and the push here would double-count
+    # it. Before the first seed the entry is left to the seed pass instead.
+    with _STATS_STATE_LOCK:
+        with _HISTORY_LOCK:
+            with open(DATA_HISTORY, "ab") as f:
+                f.write(line)
+        if _STATS_STATE["seeded"]:
+            e = _stats_entry(entry)
+            if e:
+                _STATS_STATE["entries"].append(e)
+
+
+# Marker for pulling finished_at out of a raw JSONL line, so date-range
+# filters can skip old lines with a substring compare before any JSON parse
+# (ISO-8601 timestamps order correctly as plain strings).
+_FINISHED_AT_MARKER = b'"finished_at":"'
+
+
+def _line_finished_at(line: bytes):
+    i = line.find(_FINISHED_AT_MARKER)
+    if i < 0:
+        return None
+    i += len(_FINISHED_AT_MARKER)
+    j = line.find(b'"', i)
+    if j < 0:
+        return None
+    return line[i:j]
+
+
+def _load_history(since: str = None, until: str = None) -> List[Dict[str, Any]]:
+    if not os.path.exists(DATA_HISTORY):
+        return []
+    since_b = since.encode() if since else None
+    until_b = until.encode() if until else None
+    hist = []
+    with open(DATA_HISTORY, "rb") as f:
+        for line in f:
+            if not line.strip():
+                continue
+            if since_b or until_b:
+                ts = _line_finished_at(line)
+                if ts is not None:
+                    if since_b and ts < since_b:
+                        continue
+                    if until_b and ts[:len(until_b)] > until_b:
+                        continue
+            try:
+                hist.append(orjson.loads(line))
+            except Exception:
+                continue
+    return hist
+
+
+def _migrate_legacy_history():
+    if os.path.exists(DATA_HISTORY) or not os.path.exists(DATA_HISTORY_LEGACY):
+        return
+    legacy = _load_json(DATA_HISTORY_LEGACY, [])
+    with _HISTORY_LOCK:
+        with open(DATA_HISTORY, "ab") as f:
+            for entry in legacy:
+                f.write(orjson.dumps(entry) + b"\n")
+
+
+_migrate_legacy_history()
+
 
+# Open log handles per running pipeline, so api_logs can flush buffered
+# lines on demand instead of every write paying open/close syscalls.
+_LOG_HANDLES: Dict[str, Any] = {}
+_LOG_HANDLES_LOCK = threading.Lock()
 
-def _write_log(run_id: str, line: str):
+_LOG_BUFFER_BYTES = 64 * 1024
+
+
+def _open_run_log(run_id: str):
     p = os.path.join(LOGS_DIR, f"{run_id}.log")
-    with open(p, "a", encoding="utf-8") as f:
-        f.write(line.rstrip() + "\n")
-
-
-def _simulate_step_output(step: str) -> str:
-    if step == "lint":
-        return "Lint: flake8 passed (0 errors)"
-    if step == "unit-tests":
-        return f"Unit tests: {random.randint(80, 220)} passed"
-    if step == "integration-tests":
-        return f"Integration tests: {random.randint(25, 90)} passed"
-    if step == "security-scan":
-        vulns = random.choice([0, 0, 1, 2, 3])
-        return f"Security scan: found {vulns} issues (sev: low/med/high mixed)"
-    if step == "docker-build":
-        return "Docker build: image tagged 'app:latest'"
-    if step.startswith("deploy"):
-        return f"Deploy: rollout completed, healthcheck OK"
-    if step == "install-deps":
-        return "Dependencies installed successfully"
-    if step == "checkout":
-        return "Checked out repository"
-    if step == "build-artifact":
-        return "Build artifact created: dist/app.zip"
-    return "Step completed"
+    fh = open(p, "a", encoding="utf-8", buffering=_LOG_BUFFER_BYTES)
+    with _LOG_HANDLES_LOCK:
+        _LOG_HANDLES[run_id] = fh
+    return fh
+
+
+def _close_run_log(run_id: str, fh):
+    with _LOG_HANDLES_LOCK:
+        _LOG_HANDLES.pop(run_id, None)
+    try:
+        fh.close()
+    except Exception:
+        pass
+
+
+def _archive_run_log(run_id: str):
+    # Finished logs are cold, highly repetitive text; compress them once at
+    # run completion and let api_logs read either form transparently.
+    p = os.path.join(LOGS_DIR, f"{run_id}.log")
+    if not os.path.exists(p):
+        return
+    try:
+        with open(p, "rb") as src, gzip.open(p + ".gz", "wb") as dst:
+            shutil.copyfileobj(src, dst)
+        os.remove(p)
+    except OSError:
+        pass
+
+
+def _flush_run_log(run_id: str):
+    with _LOG_HANDLES_LOCK:
+        fh = _LOG_HANDLES.get(run_id)
+    if fh is not None:
+        try:
+            fh.flush()
+        except Exception:
+            pass
+
+
+def _write_log(fh, line: str):
+    fh.write(line.rstrip() + "\n")
 
 
 def _simulate_pipeline(run: Dict[str, Any]):
@@ -117,66 +285,187 @@ def _simulate_pipeline(run: Dict[str, Any]):
     steps = run["steps"]
     start = time.time()
 
-    _write_log(run_id, f"[{_utcnow_iso()}] Run {run_id} started (job={run['job']})")
-
-    for step in steps:
-        run["current_step"] = step
-        _save_current_snapshot(run)  
+    rng = _rng()
+    compiled = COMPILED_PIPELINES.get(run["job"]) or _compile_steps(steps)
 
-        _write_log(run_id, f"[{_utcnow_iso()}] Step '{step}' started")
-        tmin, tmax = STEP_TIME.get(step, (0.8, 1.8))
-        time.sleep(random.uniform(tmin, tmax))
+    fh = _open_run_log(run_id)
+    try:
+        _write_log(fh, f"[{_utcnow_iso()}] Run {run_id} started (job={run['job']})")
 
-        _write_log(run_id, f"[{_utcnow_iso()}] { _simulate_step_output(step) }")
-
-        fail_prob = STEP_FAIL_PROB.get(step, 0.10)
-        if random.random() < fail_prob:
-            run["status"] = "failed"
-            run["finished_at"] = _utcnow_iso()
-            run["duration_s"] = int(time.time() - start)
-            _write_log(run_id, f"[{_utcnow_iso()}] Step '{step}' FAILED")
-            _write_log(run_id, f"[{_utcnow_iso()}] Run {run_id} finished with status=failed")
-            run["current_step"] = None
+        for step, tmin, tmax, fail_prob, output_fn in compiled:
+            run["current_step"] = step
             _save_current_snapshot(run)
-            _append_history(run)
+
+            _write_log(fh, f"[{_utcnow_iso()}] Step '{step}' started")
+            time.sleep(rng.uniform(tmin, tmax))
+
+            # One formatted timestamp per step boundary; every log line in
+            # the same boundary shares it instead of reformatting.
+            ts = _utcnow_iso()
+            _write_log(fh, f"[{ts}] { output_fn(rng) }")
+
+            if rng.random() < fail_prob:
+                run["status"] = "failed"
+                run["finished_at"] = ts
+                run["duration_s"] = int(time.time() - start)
+                _write_log(fh, f"[{ts}] Step '{step}' FAILED")
+                _write_log(fh, f"[{ts}] Run {run_id} finished with status=failed")
+                fh.flush()
+                run["current_step"] = None
+                _save_current_snapshot(run, flush=True)
+                _append_history(run)
+                return
+            else:
+                _write_log(fh, f"[{ts}] Step '{step}' OK")
+            fh.flush()
+
+        ts = _utcnow_iso()
+        run["status"] = "success"
+        run["finished_at"] = ts
+        run["duration_s"] = int(time.time() - start)
+        run["current_step"] = None
+        _write_log(fh, f"[{ts}] Run {run_id} finished with status=success")
+        fh.flush()
+
+        _save_current_snapshot(run, flush=True)
+        _append_history(run)
+    finally:
+        _close_run_log(run_id, fh)
+        _archive_run_log(run_id)
+
+
+# In-process view of current runs (newest first); builds.json is only a
+# persisted mirror. A single writer thread consumes flush requests from a
+# queue and coalesces bursts from concurrent pipelines into one disk write.
+_CURRENT_RUNS: "OrderedDict[str, Dict[str, Any]]" = OrderedDict()
+_CURRENT_LOCK = threading.Lock()
+_CURRENT_DIRTY = False
+_CURRENT_MAX = 100
+
+_WRITE_QUEUE: "queue.Queue" = queue.Queue()
+_WRITE_BATCH_S = 0.1
+
+
+def _flush_current():
+    global _CURRENT_DIRTY
+    with _CURRENT_LOCK:
+        if not _CURRENT_DIRTY:
             return
-        else:
-            _write_log(run_id, f"[{_utcnow_iso()}] Step '{step}' OK")
+        snapshot = list(_CURRENT_RUNS.values())
+        _CURRENT_DIRTY = False
+    try:
+        _save_json(DATA_CURRENT, snapshot)
+    except Exception:
+        with _CURRENT_LOCK:
+            _CURRENT_DIRTY = True
+        raise
+
+
+def _writer_loop():
+    while True:
+        _WRITE_QUEUE.get()
+        # Let the rest of a burst land, then drain it so N queued requests
+        # collapse into a single write of the latest state.
+        time.sleep(_WRITE_BATCH_S)
+        try:
+            while True:
+                _WRITE_QUEUE.get_nowait()
+        except queue.Empty:
+            pass
+        # A transient disk error must not kill the writer thread; the dirty
+        # flag stays set, so the next flush request retries the write.
+        try:
+            _flush_current()
+        except Exception:
+            _WRITE_QUEUE.put_nowait(None)
+
+
+def _save_current_snapshot(run: Dict[str, Any], flush: bool = False):
+    global _CURRENT_DIRTY
+    with _CURRENT_LOCK:
+        _CURRENT_RUNS.pop(run["id"], None)
+        _CURRENT_RUNS[run["id"]] = dict(run)
+        _CURRENT_RUNS.move_to_end(run["id"], last=False)
+        # Oldest entries sit at the tail (newest-first order), so the cap
+        # is a constant-time popitem instead of rebuilding a sliced list.
+        while len(_CURRENT_RUNS) > _CURRENT_MAX:
+            _CURRENT_RUNS.popitem(last=True)
+        _CURRENT_DIRTY = True
+    if flush:
+        # A failed terminal flush must not unwind into the caller and skip
+        # _append_history; hand the retry to the writer thread instead.
+        try:
+            _flush_current()
+        except OSError:
+            _WRITE_QUEUE.put_nowait(None)
+    else:
+        _WRITE_QUEUE.put_nowait(None)
 
-    run["status"] = "success"
-    run["finished_at"] = _utcnow_iso()
-    run["duration_s"] = int(time.time() - start)
-    run["current_step"] = None
-    _write_log(run_id, f"[{_utcnow_iso()}] Run {run_id} finished with status=success")
 
-    _save_current_snapshot(run)
-    _append_history(run)
+def _seed_current_runs():
+    for run in _load_json(DATA_CURRENT, [])[:_CURRENT_MAX]:
+        if run.get("id"):
+            _CURRENT_RUNS[run["id"]] = run
+
 
+_seed_current_runs()
+threading.Thread(target=_writer_loop, daemon=True).start()
 
-def _save_current_snapshot(run: Dict[str, Any]):
-    curr = _load_json(DATA_CURRENT, [])
-    curr = [x for x in curr if x.get("id") != run["id"]]
-    curr.insert(0, run)
-    _save_json(DATA_CURRENT, curr[:100])
+
+# The dashboard template has no dynamic context, so render it once on the
+# first request and serve the cached HTML afterwards.
+_INDEX_HTML = None
+_INDEX_HTML_LOCK = threading.Lock()
 
 
 @app.route("/")
 def index():
-    return render_template("index.html")
+    global _INDEX_HTML
+    if _INDEX_HTML is None:
+        with _INDEX_HTML_LOCK:
+            if _INDEX_HTML is None:
+                _INDEX_HTML = render_template("index.html")
+    return _INDEX_HTML
 
 
 @app.get("/api/builds")
 def api_builds():
-    return jsonify(_load_json(DATA_CURRENT, []))
+    with _CURRENT_LOCK:
+        return _json_response(list(_CURRENT_RUNS.values()))
+
+
+_LOG_TAIL_BYTES = 64 * 1024
 
 
 @app.get("/api/logs/<run_id>")
 def api_logs(run_id):
+    _flush_run_log(run_id)
+    try:
+        tail_bytes = int(request.args.get("tail", _LOG_TAIL_BYTES))
+    except ValueError:
+        tail_bytes = _LOG_TAIL_BYTES
+    tail_bytes = max(tail_bytes, 1)
+
     p = os.path.join(LOGS_DIR, f"{run_id}.log")
-    if not os.path.exists(p):
-        return jsonify({"log": ""})
-    with open(p, encoding="utf-8") as f:
-        return jsonify({"log": f.read()})
+    data = None
+    try:
+        # Seek to the tail instead of reading the whole file into memory.
+        with open(p, "rb") as f:
+            f.seek(0, os.SEEK_END)
+            size = f.tell()
+            f.seek(max(0, size - tail_bytes))
+            data = f.read().decode("utf-8", "replace")
+    except FileNotFoundError:
+        # The run may have finished between lookup and open, archiving the
+        # plain log; fall through to the compressed form.
+        pass
+    if data is None:
+        try:
+            with gzip.open(p + ".gz", "rb") as f:
+                data = f.read()[-tail_bytes:].decode("utf-8", "replace")
+        except FileNotFoundError:
+            data = ""
+    return Response(data, mimetype="text/plain")
 
 
 @app.post("/api/run")
@@ -199,54 +488,91 @@ def api_run():
     _save_current_snapshot(run)
 
     threading.Thread(target=_simulate_pipeline, args=(run,), daemon=True).start()
-    return jsonify({"message": "started", "run_id": run["id"]})
+    return _json_response({"message": "started", "run_id": run["id"]})
 
 
-def _calc_stats() -> Dict[str, Any]:
-    hist: List[Dict[str, Any]] = _load_json(DATA_HISTORY, [])
-    if not hist:
-        return {"deploys_today": 0, "success_rate": 0, "cfr": 0, "avg_duration": 0, "mttr_minutes": 0}
+# Rolling 7-day window of (finished_dt, finished_at, status, job,
+# duration_s) tuples. _append_history pushes completed runs in, stale
+# entries are expired on access, so /api/stats never touches the disk.
+_STATS_STATE: Dict[str, Any] = {"entries": deque(), "seeded": False}
+_STATS_STATE_LOCK = threading.Lock()
 
-    now = datetime.utcnow()
-    finished = [h for h in hist if h.get("finished_at")]
 
-    today = [
-        h for h in finished
-        if datetime.fromisoformat(h["finished_at"].rstrip("Z")).date() == now.date()
-    ]
-    last7 = [
-        h for h in finished
-        if now - datetime.fromisoformat(h["finished_at"].rstrip("Z")) <= timedelta(days=7)
-    ]
+def _stats_entry(h: Dict[str, Any]):
+    ts = h.get("finished_at")
+    if not ts:
+        return None
+    dt = datetime.fromisoformat(ts.rstrip("Z"))
+    return (dt, ts, h["status"], h["job"], h.get("duration_s") or 0)
 
-    total = len(last7)
-    failures = sum(1 for h in last7 if h["status"] == "failed")
-    successes = sum(1 for h in last7 if h["status"] == "success")
 
-    avg_dur = 0
-    ds = [h.get("duration_s") for h in last7 if h.get("duration_s")]
-    if ds:
-        avg_dur = int(sum(ds) / len(ds))
+def _stats_entries(now: datetime) -> List[Any]:
+    cutoff = now - timedelta(days=7)
+    with _STATS_STATE_LOCK:
+        entries = _STATS_STATE["entries"]
+        if not _STATS_STATE["seeded"]:
+            for h in _load_history(since=cutoff.strftime("%Y-%m-%d")):
+                e = _stats_entry(h)
+                if e:
+                    entries.append(e)
+            _STATS_STATE["seeded"] = True
+        # Runs finish in order, so expiring from the left is enough.
+        while entries and entries[0][0] < cutoff:
+            entries.popleft()
+        return list(entries)
+
+
+def _calc_stats() -> Dict[str, Any]:
+    now = datetime.utcnow()
+    entries = _stats_entries(now)
+    if not entries:
+        return {"deploys_today": 0, "success_rate": 0, "cfr": 0, "avg_duration": 0, "mttr_minutes": 0}
+
+    today_prefix = now.strftime("%Y-%m-%d")
+
+    deploys_today = 0
+    failures = 0
+    successes = 0
+    dur_sum = 0
+    dur_count = 0
+    # One sorted (finished_dt, status) timeline per job lets each failure
+    # binary-search the next success instead of rescanning the window.
+    by_job: Dict[str, List[Any]] = defaultdict(list)
+    for dt, ts, status, job, dur in entries:
+        if ts[:10] == today_prefix:
+            deploys_today += 1
+        if status == "failed":
+            failures += 1
+        elif status == "success":
+            successes += 1
+        if dur:
+            dur_sum += dur
+            dur_count += 1
+        by_job[job].append((dt, status))
+
+    total = len(entries)
+    avg_dur = int(dur_sum / dur_count) if dur_count else 0
+
+    job_dts: Dict[str, List[datetime]] = {}
+    for job, timeline in by_job.items():
+        timeline.sort()
+        job_dts[job] = [t[0] for t in timeline]
 
     mttrs = []
-    for h in last7:
-        if h["status"] != "failed":
+    for dt, ts, status, job, dur in entries:
+        if status != "failed":
             continue
-        t_fail = datetime.fromisoformat(h["finished_at"].rstrip("Z"))
-        later = [
-            x for x in last7
-            if x["job"] == h["job"]
-            and x.get("finished_at")
-            and datetime.fromisoformat(x["finished_at"].rstrip("Z")) > t_fail
-            and x["status"] == "success"
-        ]
-        if later:
-            t_succ = min(datetime.fromisoformat(x["finished_at"].rstrip("Z")) for x in later)
-            mttrs.append((t_succ - t_fail).total_seconds() / 60)
+        timeline = by_job[job]
+        i = bisect.bisect_right(job_dts[job], dt)
+        while i < len(timeline):
+            if timeline[i][1] == "success":
+                mttrs.append((timeline[i][0] - dt).total_seconds() / 60)
+                break
+            i += 1
     mttr = int(sum(mttrs) / len(mttrs)) if mttrs else 0
 
     return {
-        "deploys_today": len(today),
+        "deploys_today": deploys_today,
         "success_rate": round((successes / total) * 100, 1) if total else 0.0,
         "cfr": round((failures / total) * 100, 1) if total else 0.0,
         "avg_duration": avg_dur,
@@ -256,34 +582,65 @@ def _calc_stats() -> Dict[str, Any]:
 
 @app.get("/api/stats")
 def api_stats():
-    return jsonify(_calc_stats())
+    return _json_response(_calc_stats())
 
 @app.post("/api/reset")
 def api_reset():
+    global _CURRENT_DIRTY
+    with _CURRENT_LOCK:
+        _CURRENT_RUNS.clear()
+        _CURRENT_DIRTY = False
     _save_json(DATA_CURRENT, [])
-    _save_json(DATA_HISTORY, [])
-
-    if os.path.exists(LOGS_DIR):
-        for p in glob.glob(os.path.join(LOGS_DIR, "*.log")):
+    with _HISTORY_LOCK:
+        for p in (DATA_HISTORY, DATA_HISTORY_LEGACY):
             try:
                 os.remove(p)
-            except Exception:
+            except OSError:
                 pass
+    with _STATS_STATE_LOCK:
+        _STATS_STATE["entries"].clear()
+        _STATS_STATE["seeded"] = True
 
-    return jsonify({"message": "reset done"})
+    if os.path.exists(LOGS_DIR):
+        with os.scandir(LOGS_DIR) as it:
+            for e in it:
+                if e.name.endswith((".log", ".log.gz")):
+                    try:
+                        os.unlink(e.path)
+                    except OSError:
+                        pass
+
+    return _json_response({"message": "reset done"})
 
 @app.get("/api/history")
 def api_history():
-    hist = _load_json(DATA_HISTORY, [])
-    return jsonify(hist)
+    hist = _load_history(
+        since=request.args.get("since"),
+        until=request.args.get("until"),
+    )
+    return _json_response(hist)
 
 
 @app.get("/api/history/download")
 def api_history_download():
-    hist = _load_json(DATA_HISTORY, [])
-    payload = json.dumps(hist, indent=2)
+    # Stream the JSONL sidecar as a JSON array chunk by chunk; the lines are
+    # already serialized objects, so nothing is parsed or held in memory.
+    def generate():
+        yield b"["
+        first = True
+        if os.path.exists(DATA_HISTORY):
+            with open(DATA_HISTORY, "rb") as f:
+                for line in f:
+                    line = line.strip()
+                    if not line:
+                        continue
+                    yield b"\n  " if first else b",\n  "
+                    yield line
+                    first = False
+        yield b"\n]\n"
+
     return Response(
-        payload,
+        stream_with_context(generate()),
         mimetype="application/json",
         headers={"Content-Disposition": "attachment; filename=history.json"}
     )
@@ -292,4 +649,8 @@ def api_history_download():
 if __name__ == "__main__":
     if not os.path.exists(DATA_CURRENT):
         _save_json(DATA_CURRENT, [])
-    app.run(host="0.0.0.0", port=5000, debug=True)
+    # Werkzeug's debug server is single-threaded and keeps a reloader file
+    # watcher spinning; waitress handles the dashboard's polling endpoints
+    # concurrently.
+    from waitress import serve
+    serve(app, host="0.0.0.0", port=5000, threads=16)